@@ -1,38 +1,135 @@
 """FastAPI Users database adapter for Beanie."""
 
+from functools import cached_property
 from typing import Any, Generic, Optional, TypeVar
 
 import bson.errors
-from beanie import Document, PydanticObjectId
+from beanie import (
+    Document,
+    Insert,
+    PydanticObjectId,
+    Replace,
+    Save,
+    SaveChanges,
+    before_event,
+)
 from fastapi_users.db.base import BaseUserDatabase
 from fastapi_users.exceptions import InvalidID
 from fastapi_users.models import ID, OAP
-from pydantic import BaseModel, Field
-from pymongo import IndexModel
-from pymongo.collation import Collation
+from pydantic import BaseModel, Field, TypeAdapter
+from pymongo import ASCENDING, IndexModel
 
 __version__ = "4.0.0"
 
 
 class BeanieBaseUser(BaseModel):
+    """
+    Base user model.
+
+    Case-insensitive email lookup relies on the normalized ``email_lower``
+    field and its unique index. When upgrading a deployment created before
+    this field existed, backfill it before initializing the models:
+
+    ```py
+    await collection.update_many(
+        {"email_lower": {"$exists": False}},
+        [{"$set": {"email_lower": {"$toLower": "$email"}}}],
+    )
+    ```
+
+    Without the backfill, every pre-existing document indexes
+    ``email_lower`` as null, so ``unique_email_lower_index`` fails to build
+    and ``get_by_email`` misses existing users. The collation index from
+    earlier releases (``case_insensitive_email_index``) is no longer used
+    and can be dropped. ``$toLower`` differs from ``str.casefold`` on some
+    non-ASCII characters; re-save those users through the application if
+    that matters for your data.
+    """
+
     email: str
+    email_lower: str = ""
     hashed_password: str
     is_active: bool = True
     is_superuser: bool = False
     is_verified: bool = False
 
+    @before_event(Insert, Replace, Save, SaveChanges)
+    def normalize_email(self) -> None:
+        self.email_lower = self.email.casefold()
+
     class Settings:
-        email_collation = Collation("en", strength=2)
         indexes = [
             IndexModel(
-                "email",
-                name="case_insensitive_email_index",
-                collation=email_collation,
+                "email_lower",
+                name="unique_email_lower_index",
                 unique=True,
+                background=True,
             ),
         ]
 
 
+def oauth_account_indexes() -> list[IndexModel]:
+    """
+    Indexes for user models defining an ``oauth_accounts`` field.
+
+    ``get_by_oauth_account`` filters on ``oauth_accounts.oauth_name`` and
+    ``oauth_accounts.account_id``; without this compound multikey index,
+    every OAuth login is a full collection scan. ``account_id`` comes first
+    as the more selective field.
+
+    The index is unique, so MongoDB rejects linking the same OAuth account
+    to two different users in the storage engine instead of relying on
+    application-side checks. Note that multikey uniqueness is enforced
+    across documents only: it does not prevent duplicates within a single
+    user's ``oauth_accounts`` array.
+
+    Since ``oauth_accounts`` is defined on subclasses, append it there:
+
+    ```py
+    class UserOAuth(User):
+        oauth_accounts: list[OAuthAccount] = Field(default_factory=list)
+
+        class Settings(BeanieBaseUser.Settings):
+            indexes = BeanieBaseUser.Settings.indexes + oauth_account_indexes()
+    ```
+    """
+    return [
+        IndexModel(
+            [
+                ("oauth_accounts.account_id", ASCENDING),
+                ("oauth_accounts.oauth_name", ASCENDING),
+            ],
+            name="oauth_account_index",
+            unique=True,
+            # Filter on the dotted path: documents with an empty (or absent)
+            # oauth_accounts array would otherwise all index as null and
+            # collide with each other under the unique constraint.
+            partialFilterExpression={"oauth_accounts.account_id": {"$exists": True}},
+            background=True,
+        ),
+    ]
+
+
+async def ensure_indexes_once(document_model: type[Document]) -> None:
+    """
+    Create only the indexes missing from the model's collection.
+
+    ``init_beanie`` sends a ``createIndexes`` command on every startup even
+    when nothing changed, which blocks on large collections. This helper
+    lists the existing indexes once and only creates the missing ones,
+    skipping the repeated no-op round trips on boot.
+    """
+    settings = getattr(document_model, "Settings", None)
+    indexes: list[IndexModel] = getattr(settings, "indexes", [])
+    if not indexes:
+        return
+    collection = document_model.get_motor_collection()
+    existing = {index["name"] async for index in collection.list_indexes()}
+    missing = [index for index in indexes if index.document["name"] not in existing]
+    if missing:
+        await collection.create_indexes(missing)
+
+
 class BeanieBaseUserDocument(BeanieBaseUser, Document):  # type: ignore
     pass
 
@@ -50,16 +147,44 @@ class BaseOAuthAccount(BaseModel):
     refresh_token: Optional[str] = None
 
 
+class UserLoginProjection(BaseModel):
+    """
+    Auth-critical subset of the user document.
+
+    Fetching this instead of the full user model avoids transferring
+    large embedded arrays (e.g. OAuth accounts) on the login path.
+    """
+
+    id: PydanticObjectId = Field(alias="_id")
+    email: str
+    hashed_password: str
+    is_active: bool = True
+    is_superuser: bool = False
+    is_verified: bool = False
+
+
+_login_projection_adapter: TypeAdapter[UserLoginProjection] = TypeAdapter(
+    UserLoginProjection
+)
+
+
 class BeanieUserDatabase(
     Generic[UP_BEANIE], BaseUserDatabase[UP_BEANIE, PydanticObjectId]
 ):
     """
     Database adapter for Beanie.
 
+    Set the ``trust_input`` class attribute to ``True`` to build models with
+    ``model_construct`` in ``create``, skipping Pydantic validation. Only
+    enable it when the input dicts are already validated upstream, as the
+    fastapi-users core schemas do.
+
     :param user_model: Beanie user model.
     :param oauth_account_model: Optional Beanie OAuth account model.
     """
 
+    trust_input: bool = False
+
     def __init__(
         self,
         user_model: type[UP_BEANIE],
@@ -68,16 +193,105 @@ class BeanieUserDatabase(
         self.user_model = user_model
         self.oauth_account_model = oauth_account_model
 
-    async def get(self, id: ID) -> Optional[UP_BEANIE]:
-        """Get a single user by id."""
+    # Expression fields are resolved lazily: they only exist on the model
+    # once init_beanie has run, and the adapter may be built before that.
+    # cached_property still keeps the repeated descriptor lookups off the
+    # hot auth paths.
+
+    @cached_property
+    def _email_lower_field(self) -> Any:
+        return self.user_model.email_lower
+
+    @cached_property
+    def _oauth_name_field(self) -> Any:
+        return self.user_model.oauth_accounts.oauth_name  # type: ignore[attr-defined]
+
+    @cached_property
+    def _oauth_account_id_field(self) -> Any:
+        return self.user_model.oauth_accounts.account_id  # type: ignore[attr-defined]
+
+    async def warmup(self) -> None:
+        """
+        Run a cheap indexed query to warm up the connection.
+
+        Triggers Motor's topology discovery and opens a pooled connection so
+        the first real query doesn't pay the cold-start cost. Call it once at
+        application startup. Consider also setting ``minPoolSize``/
+        ``maxPoolSize`` on the Motor client so the first concurrent burst
+        doesn't serialize on connection creation.
+        """
+        await self.user_model.find_one({"_id": {"$exists": False}})
+
+    async def get(
+        self, id: ID, projection_model: Optional[type[BaseModel]] = None
+    ) -> Optional[UP_BEANIE]:
+        """
+        Get a single user by id.
+
+        When ``projection_model`` is given, only the fields it declares are
+        fetched and an instance of it is returned instead of the full model.
+        Paths that mutate the user (``update``/``delete``) need the full model.
+        """
+        if projection_model is not None:
+            return await self.user_model.find_one(
+                {"_id": id}, projection_model=projection_model
+            )  # type: ignore[return-value]
         return await self.user_model.get(id)  # type: ignore
 
-    async def get_by_email(self, email: str) -> Optional[UP_BEANIE]:
-        """Get a single user by email."""
+    async def get_many(self, ids: list[ID]) -> list[UP_BEANIE]:
+        """
+        Get several users by id in a single query.
+
+        Prefer this over awaiting ``get`` in a loop: it fuses N round trips
+        to MongoDB into one. Unknown ids are skipped and the order of the
+        results is not guaranteed.
+        """
+        return await self.user_model.find({"_id": {"$in": ids}}).to_list()
+
+    async def get_minimal(self, id: ID) -> Optional[UserLoginProjection]:
+        """Get the auth-critical fields of a single user by id."""
+        return await self.get(id, projection_model=UserLoginProjection)  # type: ignore[return-value]
+
+    async def get_by_email(
+        self, email: str, projection_model: Optional[type[BaseModel]] = None
+    ) -> Optional[UP_BEANIE]:
+        """
+        Get a single user by email.
+
+        When ``projection_model`` is given, only the fields it declares are
+        fetched and an instance of it is returned instead of the full model.
+        """
+        normalized_email = email.casefold()
+        if projection_model is not None:
+            return await self.user_model.find_one(
+                self._email_lower_field == normalized_email,
+                projection_model=projection_model,
+            )  # type: ignore[return-value]
         return await self.user_model.find_one(
-            self.user_model.email == email,
-            collation=self.user_model.Settings.email_collation,
+            self._email_lower_field == normalized_email
+        )
+
+    async def get_for_login(self, email: str) -> Optional[UserLoginProjection]:
+        """
+        Get the auth-critical fields of a single user by email.
+
+        Queries the Motor collection directly with a field projection and
+        validates the result through a cached ``TypeAdapter``, bypassing
+        full document hydration on the hottest auth path.
+        """
+        document = await self.user_model.get_motor_collection().find_one(
+            {"email_lower": email.casefold()},
+            {
+                "email": 1,
+                "hashed_password": 1,
+                "is_active": 1,
+                "is_superuser": 1,
+                "is_verified": 1,
+            },
         )
+        if document is None:
+            return None
+        return _login_projection_adapter.validate_python(document)
 
     async def get_by_oauth_account(
         self, oauth: str, account_id: str
@@ -87,23 +301,41 @@ class BeanieUserDatabase(
             raise NotImplementedError()
 
         return await self.user_model.find_one(
-            {
-                "oauth_accounts.oauth_name": oauth,
-                "oauth_accounts.account_id": account_id,
-            }
+            self._oauth_name_field == oauth,
+            self._oauth_account_id_field == account_id,
         )
 
     async def create(self, create_dict: dict[str, Any]) -> UP_BEANIE:
         """Create a user."""
-        user = self.user_model(**create_dict)
+        if self.trust_input:
+            user = self.user_model.model_construct(**create_dict)
+        else:
+            user = self.user_model(**create_dict)
         await user.create()
         return user
 
+    async def create_only(self, create_dict: dict[str, Any]) -> PydanticObjectId:
+        """
+        Create a user and return only its id.
+
+        Inserts the raw dict through the Motor collection, skipping Pydantic
+        validation and document hydration entirely. Use it when the caller
+        discards the created user; ``create`` remains the validated path.
+        """
+        document = {**create_dict}
+        document["email_lower"] = document["email"].casefold()
+        result = await self.user_model.get_motor_collection().insert_one(document)
+        return result.inserted_id
+
     async def update(self, user: UP_BEANIE, update_dict: dict[str, Any]) -> UP_BEANIE:
         """Update a user."""
-        for key, value in update_dict.items():
-            setattr(user, key, value)
-        await user.save()
+        if "email" in update_dict:
+            update_dict = {
+                **update_dict,
+                "email_lower": update_dict["email"].casefold(),
+            }
+        if update_dict:
+            await user.set(update_dict)
         return user
 
     async def delete(self, user: UP_BEANIE) -> None:
@@ -118,9 +350,44 @@ class BeanieUserDatabase(
             raise NotImplementedError()
 
         oauth_account = self.oauth_account_model(**create_dict)
+        await self.user_model.find_one({"_id": user.id}).update(
+            {"$push": {"oauth_accounts": oauth_account.model_dump()}}
+        )
         user.oauth_accounts.append(oauth_account)  # type: ignore
+        return user
+
+    async def add_oauth_accounts(
+        self, user: UP_BEANIE, create_dicts: list[dict[str, Any]]
+    ) -> UP_BEANIE:
+        """
+        Create several OAuth accounts and add them to the user in one query.
 
-        await user.save()
+        Prefer this over calling ``add_oauth_account`` in a loop when linking
+        several providers at once: it issues a single ``$push`` with
+        ``$each`` instead of N round trips.
+        """
+        if self.oauth_account_model is None:
+            raise NotImplementedError()
+
+        if not create_dicts:
+            return user
+
+        oauth_accounts = [
+            self.oauth_account_model(**create_dict) for create_dict in create_dicts
+        ]
+        await self.user_model.find_one({"_id": user.id}).update(
+            {
+                "$push": {
+                    "oauth_accounts": {
+                        "$each": [
+                            oauth_account.model_dump()
+                            for oauth_account in oauth_accounts
+                        ]
+                    }
+                }
+            }
+        )
+        user.oauth_accounts.extend(oauth_accounts)  # type: ignore
         return user
 
     async def update_oauth_account(
@@ -130,15 +397,40 @@ class BeanieUserDatabase(
         if self.oauth_account_model is None:
             raise NotImplementedError()
 
-        for i, existing_oauth_account in enumerate(user.oauth_accounts):  # type: ignore
-            if (
-                existing_oauth_account.oauth_name == oauth_account.oauth_name
-                and existing_oauth_account.account_id == oauth_account.account_id
-            ):
-                for key, value in update_dict.items():
-                    setattr(user.oauth_accounts[i], key, value)  # type: ignore
+        if not update_dict:
+            return user
+
+        # $elemMatch so the positional $ targets the element matching both
+        # criteria; two dotted conditions may be satisfied by different
+        # elements and land the $set on the wrong one.
+        await self.user_model.find_one(
+            {
+                "_id": user.id,
+                "oauth_accounts": {
+                    "$elemMatch": {
+                        "oauth_name": oauth_account.oauth_name,
+                        "account_id": oauth_account.account_id,
+                    }
+                },
+            }
+        ).update(
+            {
+                "$set": {
+                    f"oauth_accounts.$.{key}": value
+                    for key, value in update_dict.items()
+                }
+            }
+        )
 
-        await user.save()
+        index = {
+            (existing.oauth_name, existing.account_id): i
+            for i, existing in enumerate(user.oauth_accounts)  # type: ignore
+        }
+        i = index.get((oauth_account.oauth_name, oauth_account.account_id))
+        if i is not None:
+            # Direct dict update: the input is pre-validated upstream, so
+            # there is no need to dispatch Pydantic per-attribute hooks.
+            user.oauth_accounts[i].__dict__.update(update_dict)  # type: ignore
         return user
 
 
@@ -8,17 +8,59 @@ from typing import (
 
 from beanie import Document, PydanticObjectId
 from fastapi_users.authentication.strategy.db import AccessTokenDatabase
+from motor.motor_asyncio import AsyncIOMotorCollection
 from pydantic import BaseModel, Field
-from pymongo import IndexModel
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+from pymongo.write_concern import WriteConcern
+
+_UTC = timezone.utc
 
 
 class BeanieBaseAccessToken(BaseModel):
     token: str
     user_id: PydanticObjectId
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=lambda: datetime.now(_UTC))
 
     class Settings:
-        indexes = [IndexModel("token", unique=True)]
+        indexes = [
+            IndexModel("token", unique=True, background=True),
+            IndexModel(
+                [("user_id", ASCENDING), ("created_at", DESCENDING)],
+                name="user_id_created_at_index",
+                background=True,
+            ),
+        ]
+
+
+def access_token_ttl_index(lifetime_seconds: int) -> IndexModel:
+    """
+    TTL index evicting access tokens ``lifetime_seconds`` after creation.
+
+    Append it to the model's ``Settings.indexes`` to let MongoDB expire
+    tokens automatically instead of sweeping them manually:
+
+    ```py
+    class AccessToken(BeanieBaseAccessToken, Document):
+        class Settings(BeanieBaseAccessToken.Settings):
+            indexes = BeanieBaseAccessToken.Settings.indexes + [
+                access_token_ttl_index(3600)
+            ]
+    ```
+    """
+    return IndexModel(
+        "created_at",
+        name="access_token_ttl_index",
+        expireAfterSeconds=lifetime_seconds,
+        background=True,
+    )
+
+
+class AccessTokenProjection(BaseModel):
+    """Subset of the access token document needed to validate a token."""
+
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: PydanticObjectId
+    created_at: datetime
 
 
 class BeanieBaseAccessTokenDocument(BeanieBaseAccessToken, Document):  # type: ignore
@@ -32,31 +74,129 @@ class BeanieAccessTokenDatabase(Generic[AP_BEANIE], AccessTokenDatabase[AP_BEANI
     """
     Access token database adapter for Beanie.
 
+    Set the ``trust_input`` class attribute to ``True`` to build models with
+    ``model_construct`` in ``create``, skipping Pydantic validation. Only
+    enable it when the input dicts are already validated upstream.
+
     :param access_token_model: Beanie access token model.
+    :param write_concern: Optional write concern applied to token inserts.
+    Pass ``WriteConcern(w=0)`` to make creation fire-and-forget when token
+    durability is not critical — a lost token only forces a re-login.
+    :param use_server_created_at: If ``True`` and no explicit ``created_at``
+    is given, let MongoDB fill it with ``$currentDate`` at insert time,
+    removing clock skew between app replicas. This path inserts through the
+    Motor collection, so Beanie insert actions are not dispatched and the
+    returned timestamp is the server's tz-naive value. It honors an
+    acknowledged ``write_concern``; combining it with an unacknowledged one
+    (``w=0``) raises ``ValueError``, as findAndModify requires
+    acknowledgement.
     """
 
-    def __init__(self, access_token_model: type[AP_BEANIE]):
+    trust_input: bool = False
+
+    def __init__(
+        self,
+        access_token_model: type[AP_BEANIE],
+        write_concern: Optional[WriteConcern] = None,
+        use_server_created_at: bool = False,
+    ):
+        if (
+            use_server_created_at
+            and write_concern is not None
+            and not write_concern.acknowledged
+        ):
+            raise ValueError(
+                "use_server_created_at requires an acknowledged write concern"
+            )
         self.access_token_model = access_token_model
+        self.write_concern = write_concern
+        self.use_server_created_at = use_server_created_at
+
+    def _insert_collection(self) -> AsyncIOMotorCollection:
+        collection = self.access_token_model.get_motor_collection()
+        if self.write_concern is not None:
+            collection = collection.with_options(write_concern=self.write_concern)
+        return collection
+
+    async def warmup(self) -> None:
+        """
+        Run a cheap indexed query to warm up the connection.
+
+        Triggers Motor's topology discovery and opens a pooled connection so
+        the first real query doesn't pay the cold-start cost. Call it once at
+        application startup.
+        """
+        await self.access_token_model.find_one({"_id": {"$exists": False}})
 
     async def get_by_token(
-        self, token: str, max_age: Optional[datetime] = None
+        self,
+        token: str,
+        max_age: Optional[datetime] = None,
+        projection_model: Optional[type[BaseModel]] = None,
     ) -> Optional[AP_BEANIE]:
         query: dict[str, Any] = {"token": token}
         if max_age is not None:
             query["created_at"] = {"$gte": max_age}
+        if projection_model is not None:
+            return await self.access_token_model.find_one(
+                query, projection_model=projection_model
+            )  # type: ignore[return-value]
         return await self.access_token_model.find_one(query)
 
+    async def get_many(self, ids: list[PydanticObjectId]) -> list[AP_BEANIE]:
+        """
+        Get several access tokens by id in a single query.
+
+        Prefer this over awaiting single lookups in a loop: it fuses N round
+        trips to MongoDB into one. Unknown ids are skipped and the order of
+        the results is not guaranteed.
+        """
+        return await self.access_token_model.find({"_id": {"$in": ids}}).to_list()
+
     async def create(self, create_dict: dict[str, Any]) -> AP_BEANIE:
-        access_token = self.access_token_model(**create_dict)
+        if self.trust_input:
+            access_token = self.access_token_model.model_construct(**create_dict)
+        else:
+            access_token = self.access_token_model(**create_dict)
+        if self.use_server_created_at and "created_at" not in create_dict:
+            document = access_token.model_dump(exclude={"id"})
+            del document["created_at"]
+            inserted = await self._insert_collection().find_one_and_update(
+                {"_id": PydanticObjectId()},
+                {"$setOnInsert": document, "$currentDate": {"created_at": True}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+            access_token.id = inserted["_id"]
+            access_token.created_at = inserted["created_at"]
+            return access_token
+        if self.write_concern is not None:
+            result = await self._insert_collection().insert_one(
+                access_token.model_dump(exclude={"id"})
+            )
+            access_token.id = result.inserted_id
+            return access_token
         await access_token.create()
         return access_token
 
+    async def create_only(self, create_dict: dict[str, Any]) -> PydanticObjectId:
+        """
+        Create an access token and return only its id.
+
+        Inserts the raw dict through the Motor collection, skipping Pydantic
+        validation and document hydration entirely. Use it when the caller
+        discards the created token; ``create`` remains the validated path.
+        """
+        document = {**create_dict}
+        document.setdefault("created_at", datetime.now(_UTC))
+        result = await self._insert_collection().insert_one(document)
+        return result.inserted_id
+
     async def update(
         self, access_token: AP_BEANIE, update_dict: dict[str, Any]
     ) -> AP_BEANIE:
-        for key, value in update_dict.items():
-            setattr(access_token, key, value)
-        await access_token.save()
+        if update_dict:
+            await access_token.set(update_dict)
         return access_token
 
     async def delete(self, access_token: AP_BEANIE) -> None:
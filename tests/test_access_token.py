@@ -6,15 +6,21 @@ import pytest
 import pytest_asyncio
 from beanie import Document, PydanticObjectId, init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.write_concern import WriteConcern
 
 from fastapi_users_db_beanie.access_token import (
+    AccessTokenProjection,
     BeanieAccessTokenDatabase,
     BeanieBaseAccessToken,
+    access_token_ttl_index,
 )
 
 
 class AccessToken(BeanieBaseAccessToken, Document):
-    pass
+    class Settings(BeanieBaseAccessToken.Settings):
+        indexes = BeanieBaseAccessToken.Settings.indexes + [
+            access_token_ttl_index(3600),
+        ]
 
 
 @pytest_asyncio.fixture
@@ -62,6 +68,7 @@ async def test_queries(
     access_token = await beanie_access_token_db.create(access_token_create)
     assert access_token.token == "TOKEN"
     assert access_token.user_id == user_id
+    assert access_token.created_at is not None
 
     # Update
     updated_created_at = datetime.now(timezone.utc)
@@ -91,6 +98,13 @@ async def test_queries(
     )
     assert access_token_by_token is not None
 
+    # Get by token with projection
+    minimal_access_token = await beanie_access_token_db.get_by_token(
+        access_token.token, projection_model=AccessTokenProjection
+    )
+    assert minimal_access_token is not None
+    assert minimal_access_token.user_id == user_id
+
     # Get by token unknown
     access_token_by_token = await beanie_access_token_db.get_by_token(
         "NOT_EXISTING_TOKEN"
@@ -103,6 +117,147 @@ async def test_queries(
     assert deleted_access_token is None
 
 
+@pytest.mark.asyncio
+async def test_warmup(
+    beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
+):
+    await beanie_access_token_db.warmup()
+
+
+@pytest.mark.asyncio
+async def test_get_many(
+    beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
+    user_id: PydanticObjectId,
+):
+    access_token1 = await beanie_access_token_db.create(
+        {"token": "TOKEN1", "user_id": user_id}
+    )
+    access_token2 = await beanie_access_token_db.create(
+        {"token": "TOKEN2", "user_id": user_id}
+    )
+
+    access_tokens = await beanie_access_token_db.get_many(
+        [access_token1.id, access_token2.id]
+    )
+    assert {access_token.id for access_token in access_tokens} == {
+        access_token1.id,
+        access_token2.id,
+    }
+
+    no_access_tokens = await beanie_access_token_db.get_many([PydanticObjectId()])
+    assert no_access_tokens == []
+
+
+@pytest.mark.asyncio
+async def test_create_explicit_created_at(
+    beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
+    user_id: PydanticObjectId,
+):
+    created_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    access_token = await beanie_access_token_db.create(
+        {"token": "TOKEN", "user_id": user_id, "created_at": created_at}
+    )
+
+    assert access_token.created_at == created_at
+
+
+def test_server_created_at_unacknowledged():
+    with pytest.raises(ValueError):
+        BeanieAccessTokenDatabase(
+            AccessToken,
+            write_concern=WriteConcern(w=0),
+            use_server_created_at=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_create_write_concern_server_created_at(
+    beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
+    user_id: PydanticObjectId,
+):
+    db = BeanieAccessTokenDatabase(
+        AccessToken,
+        write_concern=WriteConcern(w=1),
+        use_server_created_at=True,
+    )
+
+    access_token = await db.create({"token": "TOKEN", "user_id": user_id})
+
+    assert access_token.id is not None
+    access_token_by_token = await db.get_by_token("TOKEN")
+    assert access_token_by_token is not None
+    assert access_token_by_token.created_at == access_token.created_at
+
+
+@pytest.mark.asyncio
+async def test_create_server_created_at(
+    beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
+    user_id: PydanticObjectId,
+):
+    db = BeanieAccessTokenDatabase(AccessToken, use_server_created_at=True)
+
+    access_token = await db.create({"token": "TOKEN", "user_id": user_id})
+    assert access_token.id is not None
+    access_token_by_token = await db.get_by_token("TOKEN")
+    assert access_token_by_token is not None
+    assert access_token_by_token.created_at == access_token.created_at
+
+    # An explicit created_at still takes the client value
+    created_at = datetime.now(timezone.utc) - timedelta(hours=2)
+    access_token = await db.create(
+        {"token": "TOKEN2", "user_id": user_id, "created_at": created_at}
+    )
+    assert access_token.created_at == created_at
+
+
+@pytest.mark.asyncio
+async def test_create_write_concern(
+    beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
+    user_id: PydanticObjectId,
+):
+    db = BeanieAccessTokenDatabase(AccessToken, write_concern=WriteConcern(w=1))
+    access_token_create = {"token": "TOKEN", "user_id": user_id}
+
+    access_token = await db.create(access_token_create)
+
+    assert access_token.id is not None
+    access_token_by_token = await db.get_by_token("TOKEN")
+    assert access_token_by_token is not None
+    assert access_token_by_token.id == access_token.id
+
+
+@pytest.mark.asyncio
+async def test_create_only(
+    beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
+    user_id: PydanticObjectId,
+):
+    access_token_id = await beanie_access_token_db.create_only(
+        {"token": "TOKEN", "user_id": user_id}
+    )
+
+    access_token_by_token = await beanie_access_token_db.get_by_token("TOKEN")
+    assert access_token_by_token is not None
+    assert access_token_by_token.id == access_token_id
+    assert access_token_by_token.created_at is not None
+
+
+@pytest.mark.asyncio
+async def test_create_trust_input(
+    beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
+    user_id: PydanticObjectId,
+):
+    beanie_access_token_db.trust_input = True
+    access_token_create = {"token": "TOKEN", "user_id": user_id}
+
+    access_token = await beanie_access_token_db.create(access_token_create)
+
+    assert access_token.token == "TOKEN"
+    assert access_token.user_id == user_id
+
+    access_token_by_token = await beanie_access_token_db.get_by_token("TOKEN")
+    assert access_token_by_token is not None
+
+
 @pytest.mark.asyncio
 async def test_insert_existing_token(
     beanie_access_token_db: BeanieAccessTokenDatabase[AccessToken],
@@ -14,6 +14,9 @@ from fastapi_users_db_beanie import (
     BeanieBaseUser,
     BeanieUserDatabase,
     ObjectIDIDMixin,
+    UserLoginProjection,
+    ensure_indexes_once,
+    oauth_account_indexes,
 )
 
 
@@ -28,6 +31,9 @@ class OAuthAccount(BaseOAuthAccount):
 class UserOAuth(User):
     oauth_accounts: list[OAuthAccount] = Field(default_factory=list)
 
+    class Settings(BeanieBaseUser.Settings):
+        indexes = BeanieBaseUser.Settings.indexes + oauth_account_indexes()
+
 
 @pytest_asyncio.fixture
 async def mongodb_client():
@@ -111,6 +117,15 @@ async def test_queries(
     unknown_user = await beanie_user_db.get_by_email("galahad@camelot.bt")
     assert unknown_user is None
 
+    # Update email keeps the normalized email in sync
+    updated_user = await beanie_user_db.update(
+        user, {"email": "Lancelot.DuLac@camelot.bt"}
+    )
+    assert updated_user.email_lower == "lancelot.dulac@camelot.bt"
+    email_user = await beanie_user_db.get_by_email("LANCELOT.DULAC@camelot.bt")
+    assert email_user is not None
+    assert email_user.id == user.id
+
     # Delete user
     await beanie_user_db.delete(user)
     deleted_user = await beanie_user_db.get(user.id)
@@ -121,6 +136,8 @@ async def test_queries(
         await beanie_user_db.get_by_oauth_account("foo", "bar")
     with pytest.raises(NotImplementedError):
         await beanie_user_db.add_oauth_account(user, {})
+    with pytest.raises(NotImplementedError):
+        await beanie_user_db.add_oauth_accounts(user, [])
     with pytest.raises(NotImplementedError):
         oauth_account = OAuthAccount(**oauth_account1)
         await beanie_user_db.update_oauth_account(user, oauth_account, {})
@@ -162,6 +179,76 @@ async def test_email_query(
         assert email_user is None
 
 
+@pytest.mark.asyncio
+async def test_warmup(beanie_user_db: BeanieUserDatabase[User]):
+    await beanie_user_db.warmup()
+
+
+@pytest.mark.asyncio
+async def test_get_many(beanie_user_db: BeanieUserDatabase[User]):
+    users = []
+    for i in range(3):
+        user = await beanie_user_db.create(
+            {"email": f"knight{i}@camelot.bt", "hashed_password": "guinevere"}
+        )
+        users.append(user)
+
+    fetched_users = await beanie_user_db.get_many([users[0].id, users[1].id])
+    assert {user.id for user in fetched_users} == {users[0].id, users[1].id}
+
+    no_users = await beanie_user_db.get_many([PydanticObjectId()])
+    assert no_users == []
+
+
+@pytest.mark.asyncio
+async def test_create_only(beanie_user_db: BeanieUserDatabase[User]):
+    user_id = await beanie_user_db.create_only(
+        {"email": "Lancelot@camelot.bt", "hashed_password": "guinevere"}
+    )
+
+    user = await beanie_user_db.get(user_id)
+    assert user is not None
+    assert user.email_lower == "lancelot@camelot.bt"
+    assert user.is_active is True
+
+    email_user = await beanie_user_db.get_by_email("lancelot@camelot.bt")
+    assert email_user is not None
+    assert email_user.id == user_id
+
+
+@pytest.mark.asyncio
+async def test_create_trust_input(beanie_user_db: BeanieUserDatabase[User]):
+    beanie_user_db.trust_input = True
+    user_create = {
+        "email": "lancelot@camelot.bt",
+        "hashed_password": "guinevere",
+    }
+
+    user = await beanie_user_db.create(user_create)
+
+    assert user.id is not None
+    assert user.is_active is True
+    assert user.email == user_create["email"]
+
+    email_user = await beanie_user_db.get_by_email("Lancelot@camelot.bt")
+    assert email_user is not None
+    assert email_user.id == user.id
+
+
+@pytest.mark.asyncio
+async def test_email_lower_sync_on_save(beanie_user_db: BeanieUserDatabase[User]):
+    user = await beanie_user_db.create(
+        {"email": "lancelot@camelot.bt", "hashed_password": "guinevere"}
+    )
+
+    user.email = "Percival@camelot.bt"
+    await user.save()
+
+    email_user = await beanie_user_db.get_by_email("percival@camelot.bt")
+    assert email_user is not None
+    assert email_user.id == user.id
+
+
 @pytest.mark.asyncio
 async def test_insert_existing_email(beanie_user_db: BeanieUserDatabase[User]):
     user_create = {
@@ -221,6 +308,12 @@ async def test_queries_oauth(
     )
     assert user.oauth_accounts[0].access_token == "NEW_TOKEN"
 
+    # Empty update is a no-op
+    user = await beanie_user_db_oauth.update_oauth_account(
+        user, user.oauth_accounts[0], {}
+    )
+    assert user.oauth_accounts[0].access_token == "NEW_TOKEN"
+
     # Get by id
     assert user.id is not None
     id_user = await beanie_user_db_oauth.get(user.id)
@@ -246,6 +339,123 @@ async def test_queries_oauth(
     assert unknown_oauth_user is None
 
 
+@pytest.mark.asyncio
+async def test_add_oauth_accounts(
+    beanie_user_db_oauth: BeanieUserDatabase[UserOAuth],
+    oauth_account1: dict[str, Any],
+    oauth_account2: dict[str, Any],
+):
+    user = await beanie_user_db_oauth.create(
+        {"email": "lancelot@camelot.bt", "hashed_password": "guinevere"}
+    )
+
+    user = await beanie_user_db_oauth.add_oauth_accounts(
+        user, [oauth_account1, oauth_account2]
+    )
+    assert len(user.oauth_accounts) == 2
+    assert user.oauth_accounts[0].account_id == oauth_account1["account_id"]
+    assert user.oauth_accounts[1].account_id == oauth_account2["account_id"]
+
+    assert user.id is not None
+    id_user = await beanie_user_db_oauth.get(user.id)
+    assert id_user is not None
+    assert len(id_user.oauth_accounts) == 2
+
+    user = await beanie_user_db_oauth.add_oauth_accounts(user, [])
+    assert len(user.oauth_accounts) == 2
+
+
+@pytest.mark.asyncio
+async def test_insert_existing_oauth_account(
+    beanie_user_db_oauth: BeanieUserDatabase[UserOAuth],
+    oauth_account1: dict[str, Any],
+):
+    user = await beanie_user_db_oauth.create(
+        {"email": "lancelot@camelot.bt", "hashed_password": "guinevere"}
+    )
+    await beanie_user_db_oauth.add_oauth_account(user, oauth_account1)
+
+    other_user = await beanie_user_db_oauth.create(
+        {"email": "galahad@camelot.bt", "hashed_password": "guinevere"}
+    )
+    with pytest.raises(pymongo.errors.DuplicateKeyError):
+        await beanie_user_db_oauth.add_oauth_account(other_user, oauth_account1)
+
+
+@pytest.mark.asyncio
+async def test_projection_queries(
+    beanie_user_db_oauth: BeanieUserDatabase[UserOAuth],
+    oauth_account1: dict[str, Any],
+):
+    user_create = {
+        "email": "lancelot@camelot.bt",
+        "hashed_password": "guinevere",
+    }
+    user = await beanie_user_db_oauth.create(user_create)
+    await beanie_user_db_oauth.add_oauth_account(user, oauth_account1)
+
+    assert user.id is not None
+    minimal_user = await beanie_user_db_oauth.get_minimal(user.id)
+    assert minimal_user is not None
+    assert minimal_user.id == user.id
+    assert minimal_user.hashed_password == "guinevere"
+    assert not hasattr(minimal_user, "oauth_accounts")
+
+    projected_user = await beanie_user_db_oauth.get(
+        user.id, projection_model=UserLoginProjection
+    )
+    assert projected_user is not None
+    assert projected_user.id == user.id
+
+    email_user = await beanie_user_db_oauth.get_by_email(
+        user_create["email"], projection_model=UserLoginProjection
+    )
+    assert email_user is not None
+    assert email_user.id == user.id
+
+    unknown_user = await beanie_user_db_oauth.get_minimal(PydanticObjectId())
+    assert unknown_user is None
+
+    login_user = await beanie_user_db_oauth.get_for_login("LANCELOT@camelot.bt")
+    assert login_user is not None
+    assert login_user.id == user.id
+    assert login_user.hashed_password == "guinevere"
+
+    unknown_login_user = await beanie_user_db_oauth.get_for_login("galahad@camelot.bt")
+    assert unknown_login_user is None
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_once(
+    beanie_user_db_oauth: BeanieUserDatabase[UserOAuth],
+):
+    collection = UserOAuth.get_motor_collection()
+    await collection.drop_index("oauth_account_index")
+
+    await ensure_indexes_once(UserOAuth)
+    index_names = {index["name"] async for index in collection.list_indexes()}
+    assert "oauth_account_index" in index_names
+
+    # Idempotent: a second call finds nothing missing
+    await ensure_indexes_once(UserOAuth)
+
+    class PlainDocument(Document):
+        pass
+
+    # Models without declared indexes are a no-op
+    await ensure_indexes_once(PlainDocument)
+
+
+def test_early_adapter_construction():
+    """It should be possible to build the adapter before init_beanie."""
+
+    class EarlyUser(Document, BeanieBaseUser):
+        pass
+
+    database = BeanieUserDatabase(EarlyUser)
+    assert database.user_model is EarlyUser
+
+
 def test_objectid_id_mixin():
     object_id_mixin = ObjectIDIDMixin()
     object_id = PydanticObjectId("62736e11bae73a7a990f7df1")